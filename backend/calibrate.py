@@ -0,0 +1,153 @@
+"""Measures the cost and strength of every level in server.DIFFICULTY_LEVELS.
+
+For each level it plays games against a random mover and against every other
+level (alternating who moves first), and prints a JSON report with the nodes
+and milliseconds spent per move, the search depth reached, how often the node
+budget or the CPU time limit ended a search, and the win/draw/loss record per
+opponent.
+
+Examples:
+    python calibrate.py --games 20
+    python calibrate.py --levels Easy,Medium,Hard --games 50 --output calibration.json
+"""
+import argparse
+import json
+import math
+import random
+import time
+
+import server
+
+
+# --- Players ---
+def flip_board(board):
+    # Swaps the two pieces so the engine (which always plays AI_PIECE) can play either side
+    flipped = board.copy()
+    flipped[board == server.PLAYER_PIECE] = server.AI_PIECE
+    flipped[board == server.AI_PIECE] = server.PLAYER_PIECE
+    return flipped
+
+def random_move(board, piece):
+    return random.choice(server.get_valid_locations(board))
+
+def new_cost():
+    return {'ms': [], 'nodes': [], 'depth': [], 'stopped_by': {'nodes': 0, 'time': 0}}
+
+def level_player(name, cost):
+    level = server.DIFFICULTY_LEVELS[name]
+
+    def play(board, piece):
+        view = board if piece == server.AI_PIECE else flip_board(board)
+        budget = server.SearchBudget(level['node_budget'], level['time_budget'])
+        start = time.perf_counter()
+        col, _ = server.find_best_move_budgeted(view, level, budget)
+        cost['ms'].append((time.perf_counter() - start) * 1000)
+        cost['nodes'].append(budget.nodes)
+        cost['depth'].append(budget.depth)
+        if budget.stopped_by:
+            cost['stopped_by'][budget.stopped_by] += 1
+        return col
+    return play
+
+
+# --- Games ---
+def play_game(first, second):
+    """Returns 1 if `first` wins, -1 if `second` wins and 0 for a draw."""
+    board = server.create_board()
+    players = ((first, server.PLAYER_PIECE), (second, server.AI_PIECE))
+    turn = 0
+    while server.get_valid_locations(board):
+        move, piece = players[turn]
+        col = move(board, piece)
+        row = server.get_next_open_row(board, col)
+        server.drop_piece(board, row, col, piece)
+        if server.check_win(board, piece):
+            return 1 if turn == 0 else -1
+        turn = 1 - turn
+    return 0
+
+def play_match(player, opponent, games):
+    record = {'wins': 0, 'draws': 0, 'losses': 0}
+    for game in range(games):
+        if game % 2 == 0:
+            result = play_game(player, opponent)
+        else:
+            result = -play_game(opponent, player)
+        key = 'wins' if result > 0 else 'losses' if result < 0 else 'draws'
+        record[key] += 1
+    # Match score: 1 per win, 0.5 per draw, as a fraction of the games played
+    record['score'] = round((record['wins'] + 0.5 * record['draws']) / games, 3)
+    return record
+
+
+# --- Report ---
+def summarize_cost(values, digits):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        'mean': round(sum(ordered) / len(ordered), digits),
+        'p95': round(ordered[math.ceil(0.95 * len(ordered)) - 1], digits),
+        'max': round(ordered[-1], digits),
+    }
+
+def calibrate(names, games):
+    costs = {name: new_cost() for name in names}
+    report = {}
+    for name in names:
+        player = level_player(name, costs[name])
+        results = {'random': play_match(player, random_move, games)}
+        for other in names:
+            if other != name:
+                # The opponent's own cost is not charged to this level
+                opponent = level_player(other, new_cost())
+                results[other] = play_match(player, opponent, games)
+        report[name] = {'config': server.DIFFICULTY_LEVELS[name], 'results': results}
+    for name in names:
+        report[name]['cost_per_move'] = {
+            'moves': len(costs[name]['ms']),
+            'nodes': summarize_cost(costs[name]['nodes'], 1),
+            'ms': summarize_cost(costs[name]['ms'], 3),
+            'depth': summarize_cost(costs[name]['depth'], 2),
+            # What ended each search: the node budget should account for almost every
+            # move (the rest reached the end of the game) and 'time' should stay at 0
+            'stopped_by': costs[name]['stopped_by'],
+        }
+    return report
+
+
+# --- Command line ---
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cost and strength of the AI difficulty levels.")
+    parser.add_argument('--levels', help="comma-separated levels to include (default: all)")
+    parser.add_argument('--games', type=int, default=10, help="games per pairing")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    names = list(server.DIFFICULTY_LEVELS)
+    if args.levels:
+        names = [name.strip() for name in args.levels.split(',')]
+        unknown = [name for name in names if name not in server.DIFFICULTY_LEVELS]
+        if unknown:
+            parser.error(f"unknown levels: {', '.join(unknown)}")
+    if args.games < 1:
+        parser.error("--games must be positive")
+    args.names = names
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    report = {
+        'config': {'games': args.games, 'seed': args.seed},
+        'levels': calibrate(args.names, args.games),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
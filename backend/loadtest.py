@@ -0,0 +1,357 @@
+"""Local load generator for the Connect-4 backend.
+
+Plays full games against /api/move at a fixed concurrency and difficulty mix,
+then prints a JSON report (throughput, p50/p95/p99 latency of successful and
+of failed requests, error rate, overall and per difficulty) for every serving
+setup that was measured.
+
+Examples:
+    python loadtest.py --setup inprocess --games 40 --concurrency 4
+    python loadtest.py --setup devserver --setup gunicorn --workers 4 --output report.json
+    python loadtest.py --setup url --url http://127.0.0.1:5000 --mix Easy=1,Hard=1
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Mirrors the board layout used by server.py (row 0 is the bottom row).
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+PLAYER_PIECE = 1
+AI_PIECE = 2
+EMPTY = 0
+
+DIFFICULTIES = ('Easy', 'Medium', 'Hard', 'Expert')
+SETUPS = ('inprocess', 'devserver', 'gunicorn', 'url')
+
+# Human players favour the middle of the board; weights are per column.
+PLAYER_COLUMN_WEIGHTS = [1, 2, 3, 4, 3, 2, 1]
+
+
+# --- Game stream helpers (pure Python, no numpy needed) ---
+def create_board():
+    return [[EMPTY] * COLUMN_COUNT for _ in range(ROW_COUNT)]
+
+def get_valid_locations(board):
+    return [c for c in range(COLUMN_COUNT) if board[ROW_COUNT - 1][c] == EMPTY]
+
+def drop_piece(board, col, piece):
+    for r in range(ROW_COUNT):
+        if board[r][col] == EMPTY:
+            board[r][col] = piece
+            return r
+    raise ValueError(f"column {col} is full")
+
+def check_win(board, piece):
+    for r in range(ROW_COUNT):
+        for c in range(COLUMN_COUNT):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+                end_r, end_c = r + 3 * dr, c + 3 * dc
+                if not (0 <= end_r < ROW_COUNT and 0 <= end_c < COLUMN_COUNT):
+                    continue
+                if all(board[r + i * dr][c + i * dc] == piece for i in range(4)):
+                    return True
+    return False
+
+def choose_player_move(board, rng):
+    valid_locations = get_valid_locations(board)
+    # Take an immediate win, otherwise block one, otherwise play center-biased.
+    for piece in (PLAYER_PIECE, AI_PIECE):
+        for col in valid_locations:
+            temp_board = [row[:] for row in board]
+            drop_piece(temp_board, col, piece)
+            if check_win(temp_board, piece):
+                return col
+    weights = [PLAYER_COLUMN_WEIGHTS[c] for c in valid_locations]
+    return rng.choices(valid_locations, weights=weights)[0]
+
+
+# --- Transports ---
+class InProcessClient:
+    """Calls the Flask app through its test client (no sockets)."""
+
+    def __init__(self):
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+        import server
+        self._local = threading.local()
+        self._app = server.app
+
+    def post_move(self, payload):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._app.test_client()
+        response = client.post('/api/move', json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Calls a running server over HTTP."""
+
+    def __init__(self, base_url, timeout):
+        self.url = base_url.rstrip('/') + '/api/move'
+        self.timeout = timeout
+
+    def post_move(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+# --- Serving setups ---
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for_port(port, proc, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited early with code {proc.returncode}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start listening on port {port} within {timeout}s")
+
+def start_server(setup, workers):
+    port = free_port()
+    if setup == 'devserver':
+        # Flask's built-in server as run by `python server.py`, minus the reloader.
+        # Werkzeug's per-request access log is silenced to match gunicorn's --log-level warning.
+        cmd = [sys.executable, '-c',
+               "import logging, server; logging.getLogger('werkzeug').setLevel(logging.ERROR); "
+               f"server.app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    else:
+        if shutil.which('gunicorn') is None:
+            raise RuntimeError("the 'gunicorn' setup needs gunicorn installed (pip install gunicorn)")
+        cmd = ['gunicorn', '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+               '--log-level', 'warning', 'server:app']
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port, proc)
+    except Exception:
+        stop_server(proc)
+        raise
+    return proc, f'http://127.0.0.1:{port}'
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# --- Load generation ---
+def play_game(client, difficulty, rng, record):
+    """Plays one game (human moves first) and records every /api/move call."""
+    board = create_board()
+    while True:
+        col = choose_player_move(board, rng)
+        drop_piece(board, col, PLAYER_PIECE)
+        if check_win(board, PLAYER_PIECE) or not get_valid_locations(board):
+            return
+
+        start = time.perf_counter()
+        try:
+            status, data = client.post_move({'board': board, 'difficulty': difficulty})
+        except Exception:
+            status, data = None, None
+        latency = time.perf_counter() - start
+
+        ai_col = data.get('column') if status == 200 and isinstance(data, dict) else None
+        ok = ai_col in get_valid_locations(board)
+        record(difficulty, latency, ok)
+        if not ok:
+            return # The stream cannot continue past a failed move
+        drop_piece(board, ai_col, AI_PIECE)
+        if check_win(board, AI_PIECE) or not get_valid_locations(board):
+            return
+
+def build_schedule(games, mix, rng):
+    # One game per level, then a largest-remainder split of the rest by weight, so
+    # every level is measured and the counts stay proportional and reproducible
+    total = sum(mix.values())
+    spare = games - len(mix)
+    quotas = {name: spare * weight / total for name, weight in mix.items()}
+    counts = {name: 1 + int(quota) for name, quota in quotas.items()}
+    leftover = games - sum(counts.values())
+    for name in sorted(quotas, key=lambda n: quotas[n] - int(quotas[n]), reverse=True)[:leftover]:
+        counts[name] += 1
+    schedule = [name for name, count in counts.items() for _ in range(count)]
+    rng.shuffle(schedule)
+    return [(name, rng.randrange(2 ** 32)) for name in schedule]
+
+def run_load(client, games, concurrency, mix, seed):
+    names = list(mix)
+    schedule = build_schedule(games, mix, random.Random(seed))
+
+    lock = threading.Lock()
+    # Failed requests are timed separately so timeouts and fast 500s don't skew the percentiles
+    samples = {name: {'latencies': [], 'error_latencies': []} for name in names}
+
+    def record(difficulty, latency, ok):
+        with lock:
+            samples[difficulty]['latencies' if ok else 'error_latencies'].append(latency)
+
+    def worker(job):
+        difficulty, game_seed = job
+        play_game(client, difficulty, random.Random(game_seed), record)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, schedule))
+    elapsed = time.perf_counter() - start
+    return samples, elapsed
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize_latency(latencies):
+    ordered = sorted(latencies)
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+    return {
+        'p50': ms(percentile(ordered, 50)),
+        'p95': ms(percentile(ordered, 95)),
+        'p99': ms(percentile(ordered, 99)),
+        'max': ms(ordered[-1] if ordered else None),
+    }
+
+def summarize(latencies, error_latencies, elapsed, rate_key):
+    requests = len(latencies) + len(error_latencies)
+    errors = len(error_latencies)
+    return {
+        'requests': requests,
+        'errors': errors,
+        'error_rate': round(errors / requests, 4) if requests else 0.0,
+        rate_key: round(requests / elapsed, 3) if elapsed > 0 else 0.0,
+        'latency_ms': summarize_latency(latencies),
+        'error_latency_ms': summarize_latency(error_latencies),
+    }
+
+def build_report(samples, elapsed):
+    all_latencies = [lat for s in samples.values() for lat in s['latencies']]
+    all_error_latencies = [lat for s in samples.values() for lat in s['error_latencies']]
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'overall': summarize(all_latencies, all_error_latencies, elapsed, 'throughput_rps'),
+        # share_rps is each level's part of the overall throughput in this mix,
+        # not the throughput that level could sustain on its own
+        'per_difficulty': {name: summarize(s['latencies'], s['error_latencies'], elapsed, 'share_rps')
+                           for name, s in samples.items()},
+    }
+
+def measure_setup(setup, args, mix):
+    proc = None
+    if setup == 'inprocess':
+        client = InProcessClient()
+    elif setup == 'url':
+        client = HttpClient(args.url, args.timeout)
+    else:
+        proc, base_url = start_server(setup, args.workers)
+        client = HttpClient(base_url, args.timeout)
+    try:
+        if args.warmup:
+            run_load(client, args.warmup, args.concurrency, mix, args.seed + 1)
+        samples, elapsed = run_load(client, args.games, args.concurrency, mix, args.seed)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+    result = {'setup': setup}
+    if setup == 'gunicorn':
+        result['workers'] = args.workers
+    result.update(build_report(samples, elapsed))
+    return result
+
+
+# --- Command line ---
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip().capitalize()
+        if name not in DIFFICULTIES:
+            raise argparse.ArgumentTypeError(f"unknown difficulty '{name}' (expected one of {', '.join(DIFFICULTIES)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight for {name}: '{weight}'")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"weight for {name} must not be negative")
+    mix = {name: w for name, w in mix.items() if w > 0}
+    if not mix:
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Connect-4 /api/move endpoint.")
+    parser.add_argument('--setup', action='append', choices=SETUPS,
+                        help="serving setup to measure; repeat to compare (default: inprocess)")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="base URL for --setup url")
+    parser.add_argument('--workers', type=int, default=4, help="worker processes for --setup gunicorn")
+    parser.add_argument('--games', type=int, default=50, help="games to play per setup")
+    parser.add_argument('--warmup', type=int, default=2, help="untimed games played before measuring")
+    parser.add_argument('--concurrency', type=int, default=8, help="games played at the same time")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('Easy=3,Medium=3,Hard=4'),
+                        help="difficulty weights, e.g. Easy=3,Medium=3,Hard=4")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the game streams")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request HTTP timeout in seconds")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.games < 1 or args.concurrency < 1 or args.workers < 1 or args.warmup < 0:
+        parser.error("--games, --concurrency and --workers must be positive, --warmup non-negative")
+    if args.games < len(args.mix):
+        parser.error(f"--games must be at least {len(args.mix)} so every level in the mix is measured")
+    args.setup = args.setup or ['inprocess']
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {
+        'config': {
+            'games': args.games,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'mix': args.mix,
+            'seed': args.seed,
+        },
+        'results': [],
+    }
+    for setup in args.setup:
+        print(f"Measuring {setup}...", file=sys.stderr)
+        report['results'].append(measure_setup(setup, args, args.mix))
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
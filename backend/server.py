@@ -1,6 +1,7 @@
 import numpy as np
 import math
 import random
+import time
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
@@ -94,7 +95,33 @@ def score_position(board, piece):
             score += evaluate_window(window, piece)
     return score
 
-def minimax(board, depth, alpha, beta, maximizing_player):
+# --- Search budgets: bound how much work one move may cost ---
+class SearchBudgetExceeded(Exception):
+    pass
+
+class SearchBudget:
+    def __init__(self, node_budget=math.inf, time_budget=math.inf):
+        self.node_budget = node_budget
+        # CPU time of this thread, so requests waiting on the GIL don't use up each other's budget
+        self.deadline = time.thread_time() + time_budget
+        self.nodes = 0
+        self.depth = 0 # Deepest search that finished
+        self.stopped_by = None # 'nodes' or 'time' once the budget has run out
+
+    def spend(self):
+        # Called once per searched node; aborts the search when the budget runs out
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            self.stopped_by = 'nodes'
+        elif time.thread_time() > self.deadline:
+            self.stopped_by = 'time'
+        else:
+            return
+        raise SearchBudgetExceeded()
+
+def minimax(board, depth, alpha, beta, maximizing_player, budget=None):
+    if budget is not None:
+        budget.spend()
     valid_locations = get_valid_locations(board)
     is_terminal = is_terminal_node(board)
     if depth == 0 or is_terminal:
@@ -114,7 +141,7 @@ def minimax(board, depth, alpha, beta, maximizing_player):
             row = get_next_open_row(board, col)
             temp_board = board.copy()
             drop_piece(temp_board, row, col, AI_PIECE)
-            new_score = minimax(temp_board, depth - 1, alpha, beta, False)[1]
+            new_score = minimax(temp_board, depth - 1, alpha, beta, False, budget)[1]
             if new_score > value:
                 value = new_score
                 column = col
@@ -129,7 +156,7 @@ def minimax(board, depth, alpha, beta, maximizing_player):
             row = get_next_open_row(board, col)
             temp_board = board.copy()
             drop_piece(temp_board, row, col, PLAYER_PIECE)
-            new_score = minimax(temp_board, depth - 1, alpha, beta, True)[1]
+            new_score = minimax(temp_board, depth - 1, alpha, beta, True, budget)[1]
             if new_score < value:
                 value = new_score
                 column = col
@@ -139,7 +166,7 @@ def minimax(board, depth, alpha, beta, maximizing_player):
         return column, value
 
 # --- NEW: Function to get all scores ---
-def get_all_ai_scores(board, depth):
+def get_all_ai_scores(board, depth, budget=None):
     scores = {}
     valid_locations = get_valid_locations(board)
 
@@ -150,31 +177,60 @@ def get_all_ai_scores(board, depth):
         drop_piece(temp_board, row, col, AI_PIECE)
         # We call minimax for the *opponent's* turn (minimizing player)
         # This tells us the "worst-case" score after we make this move.
-        scores[col] = minimax(temp_board, depth - 1, -math.inf, math.inf, False)[1]
+        scores[col] = minimax(temp_board, depth - 1, -math.inf, math.inf, False, budget)[1]
 
     return scores
 
-# --- AI "Find Best Move" Functions ---
-def find_best_move(board, depth):
-    # This now returns the best col AND the dictionary of all scores
-    scores = get_all_ai_scores(board, depth)
+# --- Difficulty levels ---
+# Each level is a node budget plus evaluation noise. The search deepens until the
+# next depth would not fit in node_budget, so the budget alone decides how deep a
+# level sees and bounds its CPU cost per move (about 0.2 ms per node on a laptop
+# CPU: Easy and Medium under 30 ms, Hard under 0.7 s, Expert under 1.8 s).
+# time_budget is a per-thread CPU time limit about 8x above that cost, so it
+# only fires in emergencies. Noise is the standard deviation of the blur added
+# to the scores before picking a move.
+# Run calibrate.py after changing these to re-measure cost and strength.
+DIFFICULTY_LEVELS = {
+    'Easy':   {'node_budget': 24,   'time_budget': 0.5,  'noise': 60}, # Depth 1
+    'Medium': {'node_budget': 128,  'time_budget': 0.5,  'noise': 15}, # Depth 2
+    'Hard':   {'node_budget': 3000, 'time_budget': 5.0,  'noise': 0},  # Depth 4 in most positions
+    'Expert': {'node_budget': 8000, 'time_budget': 15.0, 'noise': 0},  # Depth 5 in most positions
+}
+
+def find_best_move_budgeted(board, level, budget=None):
+    if budget is None:
+        budget = SearchBudget(level['node_budget'], level['time_budget'])
+
+    # Depth 1 always runs so there is a move to play; its nodes are counted but never checked
+    scores = get_all_ai_scores(board, 1)
+    budget.nodes += len(scores)
     if not scores: # If no valid moves
         return 0, {}
+    budget.depth = 1
 
-    best_col = max(scores, key=scores.get)
-    return best_col, scores
-
-def find_best_move_easy(board):
-    col = random.choice(get_valid_locations(board))
-    return col, {col: 0} # Return a simple score dict
+    # Iterative deepening: keep the scores of the deepest search that finished.
+    # Each depth costs about `growth` times the one before, so a depth that
+    # would not finish within the node budget is never started.
+    last_nodes = growth = len(scores)
+    for depth in range(2, int(np.count_nonzero(board == EMPTY)) + 1):
+        if budget.nodes + last_nodes * growth > budget.node_budget:
+            budget.stopped_by = 'nodes'
+            break
+        nodes_before = budget.nodes
+        try:
+            scores = get_all_ai_scores(board, depth, budget)
+        except SearchBudgetExceeded:
+            break
+        budget.depth = depth
+        depth_nodes = budget.nodes - nodes_before
+        growth = depth_nodes / last_nodes
+        last_nodes = depth_nodes
 
-def find_best_move_medium(board):
-    valid_locations = get_valid_locations(board)
-    center_col = COLUMN_COUNT // 2
-    if center_col in valid_locations:
-        return center_col, {center_col: 50}
-    else:
-        return find_best_move_easy(board)
+    # Blur the evaluations to pick the move, but report the real scores
+    noise = level['noise']
+    blurred = {col: score + random.gauss(0, noise) if noise else score for col, score in scores.items()}
+    best_col = max(blurred, key=blurred.get)
+    return best_col, scores
 
 # --- THE NEW API ENDPOINT ---
 @app.route('/api/move', methods=['POST'])
@@ -184,16 +240,9 @@ def handle_move():
         board = np.array(data['board'])
         difficulty = data['difficulty']
 
-        # --- Run the correct AI logic ---
-        if difficulty == 'Easy':
-            col, scores = find_best_move_easy(board)
-        elif difficulty == 'Medium':
-            col, scores = find_best_move_medium(board)
-        else: # Hard
-            # --- THIS IS THE SPEED FIX ---
-            # Changed from 4 to 3. This will be MUCH faster.
-            col, scores = find_best_move(board, 3) # Depth 3
-            # --- END OF SPEED FIX ---
+        # --- Run the correct AI logic (unknown levels play as Hard) ---
+        level = DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS['Hard'])
+        col, scores = find_best_move_budgeted(board, level)
 
         # --- NEW: Return the best column AND all the scores ---
         # Convert numpy types to standard int/float for JSON
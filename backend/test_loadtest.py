@@ -0,0 +1,94 @@
+import argparse
+import random
+from collections import Counter
+
+import pytest
+
+import loadtest
+
+
+def schedule_counts(games, mix, seed=0):
+    return Counter(name for name, _ in loadtest.build_schedule(games, mix, random.Random(seed)))
+
+
+def test_build_schedule_is_proportional():
+    assert schedule_counts(10, {'Easy': 3, 'Medium': 3, 'Hard': 4}) == {'Easy': 3, 'Medium': 3, 'Hard': 4}
+    assert schedule_counts(12, {'Easy': 1, 'Medium': 1, 'Hard': 1, 'Expert': 1}) == {
+        'Easy': 3, 'Medium': 3, 'Hard': 3, 'Expert': 3}
+
+
+def test_build_schedule_measures_every_level():
+    counts = schedule_counts(4, {'Easy': 100, 'Medium': 1, 'Hard': 1})
+    assert counts == {'Easy': 2, 'Medium': 1, 'Hard': 1}
+
+
+def test_build_schedule_is_seeded():
+    mix = {'Easy': 1, 'Hard': 2}
+    first = loadtest.build_schedule(9, mix, random.Random(5))
+    assert first == loadtest.build_schedule(9, mix, random.Random(5))
+    assert len(first) == 9
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert loadtest.percentile(values, 50) == 50
+    assert loadtest.percentile(values, 95) == 95
+    assert loadtest.percentile(values, 99) == 99
+    assert loadtest.percentile([7], 99) == 7
+    assert loadtest.percentile([], 50) is None
+
+
+def test_parse_mix():
+    assert loadtest.parse_mix('easy=2,Hard') == {'Easy': 2.0, 'Hard': 1.0}
+    # Zero weights drop a level from the mix
+    assert loadtest.parse_mix('Easy=0,Medium=1') == {'Medium': 1.0}
+
+
+@pytest.mark.parametrize('text', ['Easy=-1', 'Easy=0', 'Impossible=1', 'Easy=lots'])
+def test_parse_mix_rejects_bad_input(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        loadtest.parse_mix(text)
+
+
+def test_parse_args_needs_a_game_per_level():
+    with pytest.raises(SystemExit):
+        loadtest.parse_args(['--games', '2', '--mix', 'Easy=1,Medium=1,Hard=1'])
+
+
+def test_run_load_inprocess_report():
+    pytest.importorskip('flask')
+    samples, elapsed = loadtest.run_load(loadtest.InProcessClient(), 3, 2, {'Easy': 1, 'Medium': 2}, seed=0)
+    report = loadtest.build_report(samples, elapsed)
+
+    assert set(report) == {'elapsed_s', 'overall', 'per_difficulty'}
+    assert set(report['per_difficulty']) == {'Easy', 'Medium'}
+    overall = report['overall']
+    assert set(overall) == {'requests', 'errors', 'error_rate', 'throughput_rps', 'latency_ms', 'error_latency_ms'}
+    assert overall['requests'] > 0 and overall['errors'] == 0
+    assert set(overall['latency_ms']) == {'p50', 'p95', 'p99', 'max'}
+    assert overall['latency_ms']['p50'] <= overall['latency_ms']['p99'] <= overall['latency_ms']['max']
+    assert overall['error_latency_ms']['p50'] is None
+    for stats in report['per_difficulty'].values():
+        assert 'share_rps' in stats and 'throughput_rps' not in stats
+        assert stats['requests'] > 0
+    assert sum(s['requests'] for s in report['per_difficulty'].values()) == overall['requests']
+
+
+class FailingHardClient:
+    def post_move(self, payload):
+        if payload['difficulty'] == 'Hard':
+            return 500, {'error': 'boom'}
+        return 200, {'column': loadtest.get_valid_locations(payload['board'])[0], 'scores': {}}
+
+
+def test_failed_requests_are_timed_separately():
+    samples, elapsed = loadtest.run_load(FailingHardClient(), 4, 2, {'Easy': 1, 'Hard': 1}, seed=0)
+    report = loadtest.build_report(samples, elapsed)
+
+    hard = report['per_difficulty']['Hard']
+    assert hard['errors'] == hard['requests'] == 2 # Each game stops at its first failure
+    assert hard['error_rate'] == 1.0
+    assert hard['latency_ms']['p50'] is None
+    assert hard['error_latency_ms']['p50'] is not None
+    easy = report['per_difficulty']['Easy']
+    assert easy['errors'] == 0 and easy['error_latency_ms']['max'] is None
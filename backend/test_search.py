@@ -0,0 +1,108 @@
+import ast
+import os
+import random
+
+import pytest
+
+pytest.importorskip('flask')
+import numpy as np
+
+import server
+
+GAME_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'game.py')
+
+
+def mid_game_board():
+    # Column 3 is full (no four in a row), plus a few pieces on either side
+    board = server.create_board()
+    for row, piece in enumerate([1, 2, 1, 2, 1, 2]):
+        server.drop_piece(board, row, 3, piece)
+    for col, piece in [(2, 1), (4, 2), (2, 2), (1, 1)]:
+        server.drop_piece(board, server.get_next_open_row(board, col), col, piece)
+    return board
+
+
+def test_search_budget_raises_past_node_budget():
+    budget = server.SearchBudget(node_budget=3)
+    for _ in range(3):
+        budget.spend()
+    assert budget.stopped_by is None
+    with pytest.raises(server.SearchBudgetExceeded):
+        budget.spend()
+    assert budget.stopped_by == 'nodes'
+    assert budget.nodes == 4
+
+
+def test_search_budget_raises_past_time_budget():
+    budget = server.SearchBudget(time_budget=-1)
+    with pytest.raises(server.SearchBudgetExceeded):
+        budget.spend()
+    assert budget.stopped_by == 'time'
+
+
+def test_unfinished_depth_falls_back_to_last_completed_depth():
+    # 56 nodes lets depth 2 start (7 done + 49 predicted) but it needs 56 more, so it is aborted
+    board = server.create_board()
+    budget = server.SearchBudget(node_budget=56)
+    _, scores = server.find_best_move_budgeted(board, {'noise': 0}, budget)
+    assert budget.stopped_by == 'nodes'
+    assert budget.depth == 1
+    assert scores == server.get_all_ai_scores(board, 1)
+
+
+def test_depth_that_cannot_fit_is_not_started():
+    # Depth 2 finishes at exactly 63 nodes; depth 3 is predicted not to fit and never starts
+    board = server.create_board()
+    budget = server.SearchBudget(node_budget=63)
+    _, scores = server.find_best_move_budgeted(board, {'noise': 0}, budget)
+    assert budget.stopped_by == 'nodes'
+    assert budget.depth == 2
+    assert budget.nodes == 63
+    assert scores == server.get_all_ai_scores(board, 2)
+
+
+@pytest.mark.parametrize('name', list(server.DIFFICULTY_LEVELS))
+def test_every_level_plays_a_legal_move_with_real_scores(name):
+    random.seed(0)
+    board = mid_game_board()
+    level = server.DIFFICULTY_LEVELS[name]
+    budget = server.SearchBudget(level['node_budget'], level['time_budget'])
+    col, scores = server.find_best_move_budgeted(board, level, budget)
+
+    valid_locations = server.get_valid_locations(board)
+    assert col in valid_locations
+    assert sorted(scores) == valid_locations
+    assert budget.nodes <= level['node_budget'] + 1
+    assert budget.stopped_by == 'nodes'
+    # The reported scores are the search's own evaluations at the depth it reached
+    assert scores == server.get_all_ai_scores(board, budget.depth)
+
+
+def test_no_valid_moves():
+    board = np.ones((server.ROW_COUNT, server.COLUMN_COUNT))
+    assert server.find_best_move_budgeted(board, server.DIFFICULTY_LEVELS['Hard']) == (0, {})
+
+
+def top_level_definitions(path):
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            definitions[node.targets[0].id] = node.value
+    return definitions
+
+
+def test_game_client_search_matches_server():
+    # game.py keeps its own copy of the search (it runs without Flask); keep the two in sync
+    game = top_level_definitions(GAME_PY)
+    backend = top_level_definitions(server.__file__)
+    for name in ('SearchBudgetExceeded', 'SearchBudget', 'find_best_move_budgeted'):
+        assert ast.dump(game[name]) == ast.dump(backend[name]), name
+
+    game_levels = ast.literal_eval(game['DIFFICULTY_LEVELS'])
+    assert set(game_levels) == {'Easy', 'Medium', 'Hard'}
+    for name, level in game_levels.items():
+        assert level == server.DIFFICULTY_LEVELS[name], name
@@ -3,6 +3,7 @@ import sys
 import numpy as np
 import math
 import random
+import time
 
 # --- AI LOGIC (The "Brain") ---
 # --- Constants for AI ---
@@ -64,20 +65,13 @@ def is_terminal_node(board):
 
 # --- AI "Brain" Functions (All difficulties return score dict) ---
 
-# LEVEL: EASY
+# LEVEL: EASY (Shallow, noisy search - see DIFFICULTY_LEVELS)
 def find_best_move_easy(board):
-    valid_locations = get_valid_locations(board)
-    col = random.choice(valid_locations)
-    return col, {col: 0} # Return a simple score dict for visualization
+    return find_best_move_budgeted(board, DIFFICULTY_LEVELS['Easy'])
 
-# LEVEL: MEDIUM (Heuristic)
+# LEVEL: MEDIUM (Deeper, less noisy search)
 def find_best_move_medium(board):
-    valid_locations = get_valid_locations(board)
-    center_col = COLUMN_COUNT // 2
-    if center_col in valid_locations:
-        return center_col, {center_col: 50}
-    else:
-        return find_best_move_easy(board)
+    return find_best_move_budgeted(board, DIFFICULTY_LEVELS['Medium'])
 
 # LEVEL: HARD (Minimax)
 def evaluate_window(window, piece):
@@ -116,7 +110,32 @@ def score_position(board, piece):
             score += evaluate_window(window, piece)
     return score
 
-def minimax(board, depth, alpha, beta, maximizing_player):
+class SearchBudgetExceeded(Exception):
+    pass
+
+class SearchBudget:
+    def __init__(self, node_budget=math.inf, time_budget=math.inf):
+        self.node_budget = node_budget
+        # CPU time of this thread, not wall-clock time
+        self.deadline = time.thread_time() + time_budget
+        self.nodes = 0
+        self.depth = 0 # Deepest search that finished
+        self.stopped_by = None # 'nodes' or 'time' once the budget has run out
+
+    def spend(self):
+        # Called once per searched node; aborts the search when the budget runs out
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            self.stopped_by = 'nodes'
+        elif time.thread_time() > self.deadline:
+            self.stopped_by = 'time'
+        else:
+            return
+        raise SearchBudgetExceeded()
+
+def minimax(board, depth, alpha, beta, maximizing_player, budget=None):
+    if budget is not None:
+        budget.spend()
     valid_locations = get_valid_locations(board)
     is_terminal = is_terminal_node(board)
     if depth == 0 or is_terminal:
@@ -138,7 +157,7 @@ def minimax(board, depth, alpha, beta, maximizing_player):
             row = get_next_open_row(board, col)
             temp_board = board.copy()
             drop_piece(temp_board, row, col, AI_PIECE)
-            new_score = minimax(temp_board, depth - 1, alpha, beta, False)[1]
+            new_score = minimax(temp_board, depth - 1, alpha, beta, False, budget)[1]
             if new_score > value:
                 value = new_score
                 column = col
@@ -153,7 +172,7 @@ def minimax(board, depth, alpha, beta, maximizing_player):
             row = get_next_open_row(board, col)
             temp_board = board.copy()
             drop_piece(temp_board, row, col, PLAYER_PIECE)
-            new_score = minimax(temp_board, depth - 1, alpha, beta, True)[1]
+            new_score = minimax(temp_board, depth - 1, alpha, beta, True, budget)[1]
             if new_score < value:
                 value = new_score
                 column = col
@@ -162,21 +181,59 @@ def minimax(board, depth, alpha, beta, maximizing_player):
                 break
         return column, value
 
-def get_all_ai_scores(board, depth):
+def get_all_ai_scores(board, depth, budget=None):
     scores = {}
     valid_locations = get_valid_locations(board)
     for col in valid_locations:
         row = get_next_open_row(board, col)
         temp_board = board.copy()
         drop_piece(temp_board, row, col, AI_PIECE)
-        scores[col] = minimax(temp_board, depth - 1, -math.inf, math.inf, False)[1]
+        scores[col] = minimax(temp_board, depth - 1, -math.inf, math.inf, False, budget)[1]
     return scores
 
-def find_best_move(board, depth):
-    scores = get_all_ai_scores(board, depth)
-    if not scores:
-        return 0, {} 
-    best_col = max(scores, key=scores.get)
+# --- Difficulty levels (Easy/Medium/Hard copied from backend/server.py) ---
+# Each level is a node budget plus evaluation noise; see backend/server.py for the
+# measured cost of each level. backend/test_search.py checks that this table and
+# the search code below stay identical to the backend's copy.
+DIFFICULTY_LEVELS = {
+    'Easy':   {'node_budget': 24,   'time_budget': 0.5,  'noise': 60}, # Depth 1
+    'Medium': {'node_budget': 128,  'time_budget': 0.5,  'noise': 15}, # Depth 2
+    'Hard':   {'node_budget': 3000, 'time_budget': 5.0,  'noise': 0},  # Depth 4 in most positions
+}
+
+def find_best_move_budgeted(board, level, budget=None):
+    if budget is None:
+        budget = SearchBudget(level['node_budget'], level['time_budget'])
+
+    # Depth 1 always runs so there is a move to play; its nodes are counted but never checked
+    scores = get_all_ai_scores(board, 1)
+    budget.nodes += len(scores)
+    if not scores: # If no valid moves
+        return 0, {}
+    budget.depth = 1
+
+    # Iterative deepening: keep the scores of the deepest search that finished.
+    # Each depth costs about `growth` times the one before, so a depth that
+    # would not finish within the node budget is never started.
+    last_nodes = growth = len(scores)
+    for depth in range(2, int(np.count_nonzero(board == EMPTY)) + 1):
+        if budget.nodes + last_nodes * growth > budget.node_budget:
+            budget.stopped_by = 'nodes'
+            break
+        nodes_before = budget.nodes
+        try:
+            scores = get_all_ai_scores(board, depth, budget)
+        except SearchBudgetExceeded:
+            break
+        budget.depth = depth
+        depth_nodes = budget.nodes - nodes_before
+        growth = depth_nodes / last_nodes
+        last_nodes = depth_nodes
+
+    # Blur the evaluations to pick the move, but report the real scores
+    noise = level['noise']
+    blurred = {col: score + random.gauss(0, noise) if noise else score for col, score in scores.items()}
+    best_col = max(blurred, key=blurred.get)
     return best_col, scores
 
 # --- GAME UI (The "Body") ---
@@ -198,9 +255,6 @@ width = COLUMN_COUNT * SQUARESIZE
 height = (ROW_COUNT + 1) * SQUARESIZE
 size = (width, height)
 RADIUS = int(SQUARESIZE / 2 - 5)
-AI_DEPTH_HARD = 4
-AI_DEPTH_MEDIUM = 2
-AI_DEPTH_EASY = 0 # Not used, but good to have
 
 # --- UI Functions ---
 def draw_board(board, screen, scores_to_show=None, ai_choice=None):
@@ -343,7 +397,7 @@ def game_loop(screen, game_mode, ai_difficulty):
         if not game_over:
             # --- AI 1's Turn (in AI vs AI mode) ---
             if game_mode == 'AvA' and turn == 0:
-                col, ai_scores = find_best_move(board, AI_DEPTH_HARD) # Smart AI
+                col, ai_scores = find_best_move_budgeted(board, DIFFICULTY_LEVELS['Hard']) # Smart AI
                 ai_choice = col
                 draw_board(board, screen, ai_scores, ai_choice)
                 pygame.time.wait(1000)
@@ -368,9 +422,9 @@ def game_loop(screen, game_mode, ai_difficulty):
                     elif ai_difficulty == 'Medium':
                         col, ai_scores = find_best_move_medium(board)
                     else: # Hard
-                        col, ai_scores = find_best_move(board, AI_DEPTH_HARD)
+                        col, ai_scores = find_best_move_budgeted(board, DIFFICULTY_LEVELS['Hard'])
                 else: # AI vs AI mode, make P2 slightly dumber
-                    col, ai_scores = find_best_move(board, AI_DEPTH_MEDIUM)
+                    col, ai_scores = find_best_move_budgeted(board, DIFFICULTY_LEVELS['Medium'])
                 
                 ai_choice = col
                 draw_board(board, screen, ai_scores, ai_choice)